@@ -0,0 +1,432 @@
+"""
+Shared GNews API client
+
+HTTP access to the GNews API, used by both the MCP server (mcp_server.py)
+and the Streamlit dashboard (mcp_client.py). The dashboard calls the API
+directly through this module by default; routing through MCP adds a
+JSON-RPC envelope, stdio framing and a subprocess boundary that only
+external MCP clients need.
+"""
+
+import os
+import asyncio
+import logging
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from urllib.parse import quote_plus, urlencode
+
+import httpx
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
+# Base URL for GNews API
+GNEWS_BASE_URL = "https://gnews.io/api/v4"
+
+# Pool/transport tuning shared by the async and sync clients
+_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+_HEADERS = {"Accept": "application/json"}
+
+# One SSL context shared by every client so the certifi CA bundle is
+# loaded and verified once per process instead of once per client
+try:
+    _SSL_CONTEXT = httpx.create_ssl_context(http2=True)
+except TypeError:
+    # httpx >= 0.28 configures ALPN in the transport instead
+    _SSL_CONTEXT = httpx.create_ssl_context()
+
+# Shared HTTP client with a keep-alive connection pool. Reusing pooled
+# TCP/TLS connections across tool calls avoids paying DNS + TCP + TLS
+# handshake latency on every request, and HTTP/2 lets concurrent tool
+# calls multiplex over a single TLS connection.
+http_client = httpx.AsyncClient(
+    base_url=GNEWS_BASE_URL,
+    timeout=_TIMEOUT,
+    transport=httpx.AsyncHTTPTransport(
+        retries=3, http2=True, limits=_LIMITS, verify=_SSL_CONTEXT
+    ),
+    headers=_HEADERS,
+)
+
+
+def create_sync_client() -> httpx.Client:
+    """Create a pooled synchronous client with the same transport tuning"""
+    return httpx.Client(
+        base_url=GNEWS_BASE_URL,
+        timeout=_TIMEOUT,
+        transport=httpx.HTTPTransport(
+            retries=3, http2=True, limits=_LIMITS, verify=_SSL_CONTEXT
+        ),
+        headers=_HEADERS,
+    )
+
+
+def warm_connection(client: httpx.Client) -> None:
+    """Warm DNS and the given pooled client's TLS path in the background.
+
+    Without this the first user action pays resolver latency plus a full
+    TLS handshake on top of the actual query. The HEAD request goes
+    through the client that serves real traffic, so the connection it
+    opens stays in that client's pool for the first query to reuse; a
+    throwaway client would discard the handshake with its pool. Runs in
+    a daemon thread so startup is never delayed; failures are harmless
+    and only logged at debug level.
+    """
+
+    def _warm():
+        host = httpx.URL(GNEWS_BASE_URL).host
+        try:
+            socket.getaddrinfo(host, 443)
+            client.head("/")
+        except Exception as e:
+            logger.debug(f"Connection warmup failed: {e}")
+
+    threading.Thread(target=_warm, name="gnews-warmup", daemon=True).start()
+
+
+async def warm_connection_async() -> None:
+    """Warm DNS and the shared async client's TLS path to the GNews API.
+
+    Async counterpart of warm_connection for the MCP server: issued
+    through http_client itself so the warmed connection lands in the pool
+    the tool calls draw from. Run it as a background task from the server
+    lifespan so startup is not delayed.
+    """
+    host = httpx.URL(GNEWS_BASE_URL).host
+    try:
+        await asyncio.to_thread(socket.getaddrinfo, host, 443)
+        await http_client.head("/")
+    except Exception as e:
+        logger.debug(f"Connection warmup failed: {e}")
+
+
+# Short-TTL response cache. Dashboards tend to re-issue the exact same
+# query on every rerun; serving repeats from memory turns a network
+# round-trip into a dict lookup and saves GNews quota. The TTL is kept
+# short because news freshness matters.
+_CACHE_TTL = 60.0
+_CACHE_MAX = 256
+_cache: dict = {}  # key -> (expires_at, data)
+_cache_lock = threading.Lock()
+
+
+def _cache_key(endpoint: str, params: dict) -> tuple:
+    """Build a hashable cache key from an endpoint and its query params"""
+    return (endpoint,) + tuple(
+        sorted((k, v) for k, v in params.items() if k != "apikey")
+    )
+
+
+def _cache_get(key: tuple):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if time.monotonic() >= expires_at:
+            del _cache[key]
+            return None
+        return data
+
+
+def _cache_put(key: tuple, data: dict) -> None:
+    with _cache_lock:
+        if len(_cache) >= _CACHE_MAX:
+            now = time.monotonic()
+            expired = [k for k, (exp, _) in _cache.items() if exp <= now]
+            for k in expired:
+                del _cache[k]
+            if len(_cache) >= _CACHE_MAX:
+                # Still full: drop the oldest insertion
+                del _cache[next(iter(_cache))]
+        _cache[key] = (time.monotonic() + _CACHE_TTL, data)
+
+
+class AIMDLimiter:
+    """Adaptive concurrency limiter for the async GNews path.
+
+    Additive-increase / multiplicative-decrease: the permit count grows
+    by one while observed latency stays under the target, and halves on
+    throttling (429), server errors or latency spikes. This keeps burst
+    traffic just under the provider's ceiling instead of piling up
+    requests that will only be throttled. Retry-After responses pause
+    new acquisitions entirely for the advertised window.
+    """
+
+    C_MIN = 2
+    C_MAX = 16
+    LATENCY_TARGET = 0.8  # seconds
+    ADJUST_EVERY = 8  # completions between additive increases
+
+    def __init__(self):
+        self._limit = self.C_MIN
+        self._sem = asyncio.Semaphore(self.C_MIN)
+        self._debt = 0  # permits to swallow instead of releasing
+        self._latencies = deque(maxlen=32)
+        self._completions = 0
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        delay = self._pause_until - time.monotonic()
+        if delay > 0:
+            logger.warning(f"Rate-limit pause: waiting {delay:.1f}s before next request")
+            await asyncio.sleep(delay)
+        await self._sem.acquire()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._debt > 0:
+                # A recent decrease shrank the limit; swallow this permit
+                self._debt -= 1
+            else:
+                self._sem.release()
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._completions += 1
+            mean = sum(self._latencies) / len(self._latencies)
+            if mean > self.LATENCY_TARGET:
+                # Clear the window so one slow burst costs a single halving
+                # rather than cascading the limit down to C_MIN on every
+                # completion until fresh samples dilute the mean
+                self._latencies.clear()
+                self._decrease_locked()
+            elif self._completions % self.ADJUST_EVERY == 0:
+                self._increase_locked()
+
+    def record_failure(self, retry_after: float = 0.0) -> None:
+        with self._lock:
+            if retry_after > 0:
+                self._pause_until = max(
+                    self._pause_until, time.monotonic() + retry_after
+                )
+            self._latencies.clear()
+            self._decrease_locked()
+
+    def note_rate_limit(self, seconds: float) -> None:
+        """Pause new acquisitions without shrinking the limit"""
+        with self._lock:
+            self._pause_until = max(self._pause_until, time.monotonic() + seconds)
+
+    def _increase_locked(self) -> None:
+        if self._limit < self.C_MAX:
+            self._limit += 1
+            if self._debt > 0:
+                self._debt -= 1
+            else:
+                self._sem.release()
+
+    def _decrease_locked(self) -> None:
+        new_limit = max(self.C_MIN, self._limit // 2)
+        self._debt += self._limit - new_limit
+        self._limit = new_limit
+
+
+_limiter = AIMDLimiter()
+
+
+# Single-flight registries: concurrent callers asking for the same key
+# share one in-flight request instead of each opening their own. The
+# async side is used by the MCP server, the sync side by the dashboard.
+_inflight: dict = {}  # key -> asyncio.Future
+_inflight_lock = asyncio.Lock()
+_inflight_sync: dict = {}  # key -> concurrent.futures.Future
+_inflight_sync_lock = threading.Lock()
+
+
+def get_api_key() -> str:
+    """Get the GNews API key from environment variables"""
+    api_key = os.getenv("GNEWS_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "GNEWS_API_KEY environment variable is required. "
+            "Get your free API key from https://gnews.io/"
+        )
+    return api_key
+
+
+# Pre-quoted 'apikey=...' fragment, computed once. The key never changes
+# within a process, so there is no reason to re-quote it per request.
+_apikey_fragment = None
+
+
+def _build_url(endpoint: str, params: dict) -> str:
+    """Build the request URL with a prebuilt query string.
+
+    Encoding the query ourselves once with urlencode skips httpx's
+    per-request QueryParams construction and merging on the hot path,
+    and keeps the API key out of the params dict entirely.
+    """
+    global _apikey_fragment
+    if _apikey_fragment is None:
+        _apikey_fragment = "apikey=" + quote_plus(get_api_key())
+    qs = urlencode(params, quote_via=quote_plus)
+    return f"/{endpoint}?{qs}&{_apikey_fragment}"
+
+
+def _retry_after_seconds(response: httpx.Response) -> float:
+    """Extract a backoff hint from rate-limit response headers"""
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return 0.0
+
+
+def _parse_response(response: httpx.Response) -> dict:
+    """Parse a GNews API response, raising on non-200 status"""
+    # Article payloads compress 5-8x; httpx negotiates gzip/deflate out of
+    # the box and brotli as well once the brotli package is installed
+    logger.debug(
+        f"Response encoding: {response.headers.get('Content-Encoding', 'identity')}"
+    )
+    if response.status_code == 200:
+        # orjson parses the raw bytes directly and is several times
+        # faster than stdlib json on large article payloads
+        data = orjson.loads(response.content)
+        logger.info(f"Successfully retrieved {data.get('totalArticles', 0)} articles")
+        return data
+
+    error_msg = f"GNews API error: {response.status_code}"
+    try:
+        error_data = response.json()
+        if "errors" in error_data:
+            error_msg += f" - {error_data['errors']}"
+    except:
+        error_msg += f" - {response.text}"
+
+    logger.error(error_msg)
+    raise Exception(error_msg)
+
+
+async def make_gnews_request(endpoint: str, params: dict) -> dict:
+    """Make a request to the GNews API"""
+    get_api_key()  # fail fast if the key is missing
+
+    key = _cache_key(endpoint, params)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info(f"Cache hit for {endpoint}")
+        return cached
+
+    # Collapse concurrent identical requests onto one in-flight future
+    async with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = asyncio.get_running_loop().create_future()
+            _inflight[key] = future
+
+    if owner:
+        try:
+            logger.info(f"Making request to {endpoint} with params: {params}")
+            url = _build_url(endpoint, params)
+            await _limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = await http_client.get(url)
+            finally:
+                _limiter.release()
+
+            if response.status_code == 429 or response.status_code >= 500:
+                _limiter.record_failure(retry_after=_retry_after_seconds(response))
+            else:
+                _limiter.record_success(time.monotonic() - start)
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    # Quota exhausted for this window; back off proactively
+                    _limiter.note_rate_limit(1.0)
+
+            data = _parse_response(response)
+            _cache_put(key, data)
+            future.set_result(data)
+        except httpx.RequestError as e:
+            _limiter.record_failure()
+            error_msg = f"Network error connecting to GNews API: {str(e)}"
+            logger.error(error_msg)
+            future.set_exception(Exception(error_msg))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            # If the owner was cancelled mid-request (a BaseException, so
+            # neither except clause ran), resolve the shared future anyway
+            # or every joined waiter would block on it forever
+            if not future.done():
+                future.cancel()
+            async with _inflight_lock:
+                _inflight.pop(key, None)
+    else:
+        logger.info(f"Joining in-flight request for {endpoint}")
+
+    return await future
+
+
+def search_news_http(
+    client: httpx.Client,
+    q: str,
+    lang: str = None,
+    country: str = None,
+    max_articles: int = 10,
+) -> dict:
+    """Search for news articles via a direct, synchronous GNews API call.
+
+    Used by the Streamlit dashboard to skip the MCP layer entirely when
+    caller and server are co-located. Returns the same response shape as
+    the search_news MCP tool.
+    """
+    params = {"q": q}
+
+    if lang:
+        params["lang"] = lang
+    if country:
+        params["country"] = country
+    if max_articles:
+        params["max"] = max_articles
+
+    key = _cache_key("search", params)
+    result = _cache_get(key)
+    if result is None:
+        # Collapse concurrent identical requests onto one in-flight future
+        with _inflight_sync_lock:
+            future = _inflight_sync.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                _inflight_sync[key] = future
+
+        if owner:
+            try:
+                response = client.get(_build_url("search", params))
+                result = _parse_response(response)
+                _cache_put(key, result)
+                future.set_result(result)
+            except httpx.RequestError as e:
+                error_msg = f"Network error connecting to GNews API: {str(e)}"
+                logger.error(error_msg)
+                future.set_exception(Exception(error_msg))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                # Resolve the shared future even if the owner died on a
+                # BaseException, so joined waiters are never stranded
+                if not future.done():
+                    future.cancel()
+                with _inflight_sync_lock:
+                    _inflight_sync.pop(key, None)
+
+        result = future.result()
+
+    return {
+        "success": True,
+        "query": q,
+        "totalArticles": result.get("totalArticles", 0),
+        "articles": result.get("articles", []),
+    }
@@ -1,24 +1,38 @@
 import asyncio
-import json
+import html
 import os
 import sys
-from typing import Any, Dict, Optional, List
-
+import threading
+import time
+from contextlib import AsyncExitStack
+from string import Template
+from typing import Any, Dict, Optional, List, Tuple
+
+import anyio
+import httpx
+import orjson
 import streamlit as st
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, McpError, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from PIL import Image
 
+from gnews_client import create_sync_client, search_news_http, warm_connection
+
 # ---------------------------------------------------------------------
 # Page configuration
 # ---------------------------------------------------------------------
 LOGO_PATH = "logo_gnews_mcp.png"  # light/white logo recommended
 
 
+@st.cache_resource(show_spinner=False)
 def load_logo() -> Any:
     """Load a logo image if available, otherwise fall back to an emoji."""
     if os.path.exists(LOGO_PATH):
-        return Image.open(LOGO_PATH)
+        # Decode and downscale once; reruns reuse the cached thumbnail
+        # instead of re-encoding the full-resolution PNG every time
+        logo = Image.open(LOGO_PATH).convert("RGB")
+        logo.thumbnail((256, 256))
+        return logo
     return "📰"
 
 
@@ -33,13 +47,18 @@ st.set_page_config(
 # ---------------------------------------------------------------------
 # Global styling
 # ---------------------------------------------------------------------
-def load_css(path: str = "style.css") -> None:
+@st.cache_data(show_spinner=False)
+def load_css(path: str = "style.css") -> str:
+    """Read the stylesheet once; reruns get the cached string."""
     if os.path.exists(path):
         with open(path, encoding="utf-8") as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+            return f.read()
+    return ""
 
 
-load_css()
+_css = load_css()
+if _css:
+    st.markdown(f"<style>{_css}</style>", unsafe_allow_html=True)
 
 # Hide default Streamlit UI chrome
 st.markdown(
@@ -55,15 +74,65 @@ st.markdown(
 
 
 # ---------------------------------------------------------------------
-# MCP client integration
+# Direct GNews API integration (default path)
 # ---------------------------------------------------------------------
-async def call_gnews_mcp(
+@st.cache_resource(show_spinner=False)
+def _get_gnews_http_client() -> httpx.Client:
+    """Pooled HTTP client shared across reruns for direct API calls."""
+    client = create_sync_client()
+    # Warm DNS + TLS through this client's own pool so the first search
+    # reuses the handshake instead of paying it
+    warm_connection(client)
+    return client
+
+
+# Create and warm the pooled client while the user is still reading the
+# page; st.cache_resource makes this a no-op on later reruns
+_get_gnews_http_client()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _search_news_direct(
     query: str,
     lang: str,
     country: str,
     max_results: int,
 ) -> Optional[Dict[str, Any]]:
-    """Invoke the GNews MCP server and return the JSON payload."""
+    """Direct API search, memoised so identical reruns skip the network."""
+    return search_news_http(
+        _get_gnews_http_client(),
+        q=query,
+        lang=lang,
+        country=country,
+        max_articles=max_results,
+    )
+
+
+# ---------------------------------------------------------------------
+# MCP client integration
+# ---------------------------------------------------------------------
+# Persistent event loop running in a daemon thread. Using asyncio.run()
+# per search would tear down the loop -- and with it the MCP subprocess --
+# on every click; scheduling onto one long-lived loop keeps the server
+# process (and its warm HTTP connections) alive across reruns. The loop
+# lives behind st.cache_resource because Streamlit re-executes this whole
+# script on every widget interaction: module-level statements would leak
+# a fresh loop and thread per rerun, and the cached MCP session would end
+# up driven from a different loop than the one that created it.
+@st.cache_resource(show_spinner=False)
+def _get_mcp_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="mcp-loop", daemon=True).start()
+    return loop
+
+
+def _run_on_loop(coro) -> Any:
+    """Run a coroutine on the persistent background loop and wait for it."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_mcp_loop()).result()
+
+
+async def _open_mcp_session() -> Tuple[AsyncExitStack, ClientSession]:
+    """Spawn the MCP server subprocess and complete the initialize handshake."""
     api_key = os.getenv("GNEWS_API_KEY")
     if not api_key:
         raise RuntimeError("Environment variable GNEWS_API_KEY is not set.")
@@ -75,29 +144,89 @@ async def call_gnews_mcp(
         env={"GNEWS_API_KEY": api_key},
     )
 
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            result = await session.call_tool(
-                "search_news",
-                arguments={
-                    "q": query,
-                    "lang": lang,
-                    "country": country,
-                    "max": max_results,
-                },
-            )
+    stack = AsyncExitStack()
+    read, write = await stack.enter_async_context(stdio_client(server_params))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return stack, session
+
+
+def _get_mcp_session() -> ClientSession:
+    """Return the cached MCP session, spawning the subprocess on first use."""
+    cached = st.session_state.get("mcp_session")
+    if cached is None:
+        cached = _run_on_loop(_open_mcp_session())
+        st.session_state["mcp_session"] = cached
+    return cached[1]
 
-            payloads: List[Dict[str, Any]] = []
-            for item in result.content:
-                if item.type == "text":
-                    try:
-                        payloads.append(json.loads(item.text))
-                    except json.JSONDecodeError:
-                        st.error("Unable to parse response from MCP server.")
-                        return None
 
-            return payloads[0] if payloads else None
+def _close_mcp_session() -> None:
+    """Tear down the cached MCP session so the next call respawns it."""
+    cached = st.session_state.pop("mcp_session", None)
+    if cached is not None:
+        try:
+            _run_on_loop(cached[0].aclose())
+        except Exception:
+            pass
+
+
+async def _call_search_tool(
+    session: ClientSession,
+    query: str,
+    lang: str,
+    country: str,
+    max_results: int,
+) -> Optional[Dict[str, Any]]:
+    """Invoke the search_news tool and return the JSON payload."""
+    result = await session.call_tool(
+        "search_news",
+        arguments={
+            "q": query,
+            "lang": lang,
+            "country": country,
+            "max_articles": max_results,
+        },
+    )
+
+    # Only the first text payload is ever rendered; parse and return it as
+    # soon as it appears instead of materialising every content item first
+    for item in result.content:
+        if item.type == "text":
+            try:
+                return orjson.loads(item.text)
+            except orjson.JSONDecodeError:
+                st.error("Unable to parse response from MCP server.")
+                return None
+
+    return None
+
+
+def call_gnews_mcp(
+    query: str,
+    lang: str,
+    country: str,
+    max_results: int,
+) -> Optional[Dict[str, Any]]:
+    """Search via the long-lived MCP session, respawning it if the pipe died."""
+    for attempt in range(2):
+        session = _get_mcp_session()
+        try:
+            return _run_on_loop(
+                _call_search_tool(session, query, lang, country, max_results)
+            )
+        except (
+            BrokenPipeError,
+            EOFError,
+            McpError,
+            anyio.BrokenResourceError,
+            anyio.ClosedResourceError,
+        ):
+            # A dead stdio subprocess surfaces through the mcp/anyio stack
+            # as McpError or a broken/closed resource -- respawn once
+            _close_mcp_session()
+            if attempt == 1:
+                raise
+    return None
 
 
 # ---------------------------------------------------------------------
@@ -182,6 +311,12 @@ def render_sidebar() -> Dict[str, Any]:
             type="primary",
             use_container_width=True,
         )
+        route_via_mcp = st.toggle(
+            "Route via MCP",
+            value=False,
+            help="Call the GNews API through the MCP server subprocess "
+            "instead of directly. Useful for demoing the MCP transport.",
+        )
 
         st.markdown("---")
         st.markdown(
@@ -204,6 +339,7 @@ def render_sidebar() -> Dict[str, Any]:
         "country": country,
         "max_results": max_results,
         "search_triggered": search_triggered,
+        "route_via_mcp": route_via_mcp,
     }
 
 
@@ -226,6 +362,34 @@ def render_metrics(
         st.metric("Country", country.upper())
 
 
+# Article card templates, compiled once at import. Substituting into these
+# is cheaper than re-building f-string HTML per article per rerun, and
+# emitting one markdown block per card body keeps the number of Streamlit
+# delta round-trips constant per article.
+_ARTICLE_BODY_TPL = Template(
+    """
+    <div class="article-meta">
+        <div class="article-source">$source</div>
+        <div class="article-date">$published_at</div>
+    </div>
+    <p class="article-description">$description</p>
+    $link
+    """
+)
+
+_ARTICLE_LINK_TPL = Template(
+    '<a href="$url" target="_blank" class="article-link">Open full article ↗</a>'
+)
+
+_ARTICLE_IMAGE_TPL = Template(
+    """
+    <div class="article-image-container">
+        <img src="$url" class="article-image" />
+    </div>
+    """
+)
+
+
 def render_articles(articles: List[Dict[str, Any]]) -> None:
     """Render article list as card-style expanders."""
     st.markdown('<h3 class="section-title">Articles</h3>', unsafe_allow_html=True)
@@ -256,29 +420,26 @@ def render_articles(articles: List[Dict[str, Any]]) -> None:
             card_cols = st.columns([0.8, 0.2])
 
             with card_cols[0]:
+                link_html = (
+                    _ARTICLE_LINK_TPL.substitute(url=html.escape(url, quote=True))
+                    if url
+                    else ""
+                )
                 st.markdown(
-                    f"""
-                    <div class="article-meta">
-                        <div class="article-source">{source}</div>
-                        <div class="article-date">{published_at}</div>
-                    </div>
-                    """,
+                    _ARTICLE_BODY_TPL.substitute(
+                        source=html.escape(str(source)),
+                        published_at=html.escape(str(published_at)),
+                        description=html.escape(str(description)),
+                        link=link_html,
+                    ),
                     unsafe_allow_html=True,
                 )
-                st.markdown(f'<p class="article-description">{description}</p>', unsafe_allow_html=True)
-                if url:
-                    st.markdown(
-                        f'<a href="{url}" target="_blank" class="article-link">Open full article ↗</a>',
-                        unsafe_allow_html=True,
-                    )
             with card_cols[1]:
                 if img_url:
                     st.markdown(
-                        f"""
-                        <div class="article-image-container">
-                            <img src="{img_url}" class="article-image" />
-                        </div>
-                        """,
+                        _ARTICLE_IMAGE_TPL.substitute(
+                            url=html.escape(img_url, quote=True)
+                        ),
                         unsafe_allow_html=True,
                     )
 
@@ -320,6 +481,12 @@ def main() -> None:
             "country": params["country"],
             "max_results": params["max_results"],
         }
+        # Keep the previous trigger's timestamp before overwriting so the
+        # debounce below can measure the gap between successive clicks
+        st.session_state.prev_trigger_ts = st.session_state.get(
+            "last_trigger_ts", 0.0
+        )
+        st.session_state.last_trigger_ts = time.monotonic()
 
     if not st.session_state.search_clicked or not query:
         st.markdown(
@@ -338,16 +505,30 @@ def main() -> None:
     # Use last committed params for consistency across reruns
     active_params = st.session_state.last_params
 
-    with st.spinner("Fetching latest news from GNews via MCP..."):
+    # Debounce rapid triggers: only a click landing within 250 ms of the
+    # previous one waits out the collapse window and reruns, so a burst of
+    # clicks results in one API call while isolated clicks fetch directly
+    if params["search_triggered"]:
+        if time.monotonic() - st.session_state.prev_trigger_ts < 0.25:
+            time.sleep(0.25)
+            st.rerun()
+
+    with st.spinner("Fetching latest news from GNews..."):
         try:
-            result = asyncio.run(
-                call_gnews_mcp(
+            if params["route_via_mcp"]:
+                result = call_gnews_mcp(
+                    query=active_params["query"],
+                    lang=active_params["lang"],
+                    country=active_params["country"],
+                    max_results=active_params["max_results"],
+                )
+            else:
+                result = _search_news_direct(
                     query=active_params["query"],
                     lang=active_params["lang"],
                     country=active_params["country"],
                     max_results=active_params["max_results"],
                 )
-            )
         except Exception as exc:
             st.error(
                 f"Enterprise alert: {exc} · Please contact the platform administrator if this persists."
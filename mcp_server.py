@@ -14,15 +14,19 @@ Features:
 """
 
 import os
+import sys
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from typing import Optional, Literal, List
 from datetime import datetime
 from enum import Enum
 
-import httpx
 from pydantic import BaseModel, Field, validator
 from mcp.server.fastmcp import FastMCP
 
+from gnews_client import get_api_key, http_client, make_gnews_request, warm_connection_async
+
 
 # Configure logging for STDIO transport (writes to stderr)
 logging.basicConfig(
@@ -32,10 +36,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Manage shared resources on the server's own event loop"""
+    # Warm DNS + TLS through the shared client while the transport starts,
+    # so the warmed connection sits in the pool the tool calls draw from
+    warm_task = asyncio.create_task(warm_connection_async())
+    try:
+        yield
+    finally:
+        warm_task.cancel()
+        # Close here, on the loop that owns the pooled connections; closing
+        # from a fresh loop after mcp.run() returns would call into the
+        # already-closed loop and raise 'Event loop is closed'
+        await http_client.aclose()
+
+
 # Create FastMCP server
 mcp = FastMCP(
     name="gnews-server",
-    instructions="A Model Context Protocol server for accessing GNews API. Provides tools to search news articles and get top headlines."
+    instructions="A Model Context Protocol server for accessing GNews API. Provides tools to search news articles and get top headlines.",
+    # When served over streamable-http, answer single-shot tool calls with a
+    # plain JSON body instead of wrapping them in SSE frames the client then
+    # has to iterate and decode
+    json_response=True,
+    lifespan=server_lifespan,
 )
 
 # Supported languages and countries (from GNews API documentation)
@@ -69,55 +94,6 @@ class NewsResponse(BaseModel):
     articles: List[dict]
 
 
-def get_api_key() -> str:
-    """Get the GNews API key from environment variables"""
-    api_key = os.getenv("GNEWS_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "GNEWS_API_KEY environment variable is required. "
-            "Get your free API key from https://gnews.io/"
-        )
-    return api_key
-
-
-async def make_gnews_request(endpoint: str, params: dict) -> dict:
-    """Make a request to the GNews API"""
-    api_key = get_api_key()
-    
-    # Add API key to parameters
-    params["apikey"] = api_key
-    
-    # Base URL for GNews API
-    base_url = "https://gnews.io/api/v4"
-    url = f"{base_url}/{endpoint}"
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            logger.info(f"Making request to {endpoint} with params: {params}")
-            response = await client.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                logger.info(f"Successfully retrieved {data.get('totalArticles', 0)} articles")
-                return data
-            else:
-                error_msg = f"GNews API error: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    if "errors" in error_data:
-                        error_msg += f" - {error_data['errors']}"
-                except:
-                    error_msg += f" - {response.text}"
-                
-                logger.error(error_msg)
-                raise Exception(error_msg)
-                
-    except httpx.RequestError as e:
-        error_msg = f"Network error connecting to GNews API: {str(e)}"
-        logger.error(error_msg)
-        raise Exception(error_msg)
-
-
 @mcp.tool()
 async def search_news(
     q: str = Field(description="Search keywords. Use logical operators like AND, OR, NOT. Use quotes for exact phrases."),
@@ -184,11 +160,12 @@ async def search_news(
     
     try:
         result = await make_gnews_request("search", params)
+        articles = result.get("articles") or []
         return {
             "success": True,
             "query": q,
-            "totalArticles": result.get("totalArticles", 0),
-            "articles": result.get("articles", []),
+            "totalArticles": result.get("totalArticles", len(articles)),
+            "articles": articles,
             "parameters_used": params
         }
     except Exception as e:
@@ -277,11 +254,12 @@ async def get_top_headlines(
     try:
         logger.info(f"Getting top headlines for category '{category}' with params: {params}")
         result = await make_gnews_request("top-headlines", params)
+        articles = result.get("articles") or []
         return {
             "success": True,
             "category": category or "general",
-            "totalArticles": result.get("totalArticles", 0),
-            "articles": result.get("articles", []),
+            "totalArticles": result.get("totalArticles", len(articles)),
+            "articles": articles,
             "parameters_used": params
         }
     except Exception as e:
@@ -293,6 +271,171 @@ async def get_top_headlines(
         }
 
 
+@mcp.tool()
+async def get_top_headlines_multi(
+    categories: List[Literal["general", "world", "nation", "business", "technology", "entertainment", "sports", "science", "health"]] = Field(
+        description="News categories to fetch in a single call"
+    ),
+    lang: Optional[str] = Field(default=None, description=f"Language code (2 letters). Supported: {', '.join(SUPPORTED_LANGUAGES.keys())}"),
+    country: Optional[str] = Field(default=None, description=f"Country code (2 letters). Supported: {', '.join(SUPPORTED_COUNTRIES.keys())}"),
+    max_articles: Optional[int] = Field(default=10, description="Number of articles to return per category (1-100)")
+) -> dict:
+    """
+    Get top headlines for several categories in one tool call.
+
+    Fetching categories one call at a time pays the full MCP round-trip
+    (envelope construction, framing, parsing) per category. This tool
+    accepts a list of categories and fans the GNews requests out
+    concurrently, so a dashboard refreshing six categories pays one
+    round-trip instead of six.
+
+    Returns a structured response with one entry per requested category,
+    each carrying its own success flag, article count and article list.
+    """
+
+    # Validate parameters
+    if not categories:
+        raise ValueError("At least one category is required")
+
+    for category in categories:
+        if category not in CATEGORIES:
+            raise ValueError(f"Unsupported category '{category}'. Supported categories: {', '.join(CATEGORIES)}")
+
+    if lang and lang not in SUPPORTED_LANGUAGES:
+        raise ValueError(f"Unsupported language '{lang}'. Supported languages: {', '.join(SUPPORTED_LANGUAGES.keys())}")
+
+    if country and country not in SUPPORTED_COUNTRIES:
+        raise ValueError(f"Unsupported country '{country}'. Supported countries: {', '.join(SUPPORTED_COUNTRIES.keys())}")
+
+    if max_articles and (max_articles < 1 or max_articles > 100):
+        raise ValueError("Max articles must be between 1 and 100")
+
+    # Build one request per category and run them concurrently
+    def build_params(category: str) -> dict:
+        params = {"category": category}
+        if lang:
+            params["lang"] = lang
+        if country:
+            params["country"] = country
+        if max_articles:
+            params["max"] = max_articles
+        return params
+
+    logger.info(f"Getting top headlines for {len(categories)} categories")
+    raw_results = await asyncio.gather(
+        *(make_gnews_request("top-headlines", build_params(c)) for c in categories),
+        return_exceptions=True,
+    )
+
+    results = []
+    for category, result in zip(categories, raw_results):
+        if isinstance(result, Exception):
+            results.append({
+                "success": False,
+                "category": category,
+                "error": str(result)
+            })
+        else:
+            results.append({
+                "success": True,
+                "category": category,
+                "totalArticles": result.get("totalArticles", 0),
+                "articles": result.get("articles", [])
+            })
+
+    return {
+        "success": all(r["success"] for r in results),
+        "categories": list(categories),
+        "results": results
+    }
+
+
+@mcp.tool()
+async def search_news_batch(
+    queries: List[dict] = Field(
+        description="List of search query objects. Each needs 'q' (search keywords) and may set 'lang', 'country' and 'max_articles'."
+    )
+) -> dict:
+    """
+    Run several news searches concurrently in a single tool call.
+
+    Dashboards that fan out across topics, languages or countries would
+    otherwise issue one MCP tool call per query and wait on each in turn.
+    This tool accepts a list of query objects and runs the GNews requests
+    concurrently over the shared connection pool, with the adaptive
+    concurrency limiter keeping the fan-out under the provider's ceiling.
+
+    Each query object supports:
+    - q: Search keywords (required)
+    - lang: Language code (2 letters)
+    - country: Country code (2 letters)
+    - max_articles: Number of articles to return (1-100)
+
+    Returns one result entry per query, in input order, each carrying its
+    own success flag, article count and article list.
+    """
+
+    # Validate parameters
+    if not queries:
+        raise ValueError("At least one query is required")
+
+    request_params = []
+    for i, query in enumerate(queries):
+        q = query.get("q")
+        if not q:
+            raise ValueError(f"Query {i} is missing the required 'q' field")
+
+        lang = query.get("lang")
+        country = query.get("country")
+        max_articles = query.get("max_articles", 10)
+
+        if lang and lang not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language '{lang}'. Supported languages: {', '.join(SUPPORTED_LANGUAGES.keys())}")
+
+        if country and country not in SUPPORTED_COUNTRIES:
+            raise ValueError(f"Unsupported country '{country}'. Supported countries: {', '.join(SUPPORTED_COUNTRIES.keys())}")
+
+        if max_articles and (max_articles < 1 or max_articles > 100):
+            raise ValueError("Max articles must be between 1 and 100")
+
+        params = {"q": q}
+        if lang:
+            params["lang"] = lang
+        if country:
+            params["country"] = country
+        if max_articles:
+            params["max"] = max_articles
+        request_params.append(params)
+
+    logger.info(f"Running batch search with {len(request_params)} queries")
+    raw_results = await asyncio.gather(
+        *(make_gnews_request("search", p) for p in request_params),
+        return_exceptions=True,
+    )
+
+    results = []
+    for params, result in zip(request_params, raw_results):
+        if isinstance(result, Exception):
+            results.append({
+                "success": False,
+                "query": params["q"],
+                "error": str(result)
+            })
+        else:
+            articles = result.get("articles") or []
+            results.append({
+                "success": True,
+                "query": params["q"],
+                "totalArticles": result.get("totalArticles", len(articles)),
+                "articles": articles
+            })
+
+    return {
+        "success": all(r["success"] for r in results),
+        "results": results
+    }
+
+
 def main():
     """Run the GNews MCP server"""
     logger.info("Starting GNews MCP Server...")
@@ -303,11 +446,14 @@ def main():
         logger.info("GNews API key found")
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
-        print(f"Error: {e}", file=os.sys.stderr)
+        print(f"Error: {e}", file=sys.stderr)
         return
     
-    # Run the server using stdio transport
-    mcp.run(transport="stdio")
+    # Run the server; stdio by default, set MCP_TRANSPORT=streamable-http
+    # to serve remote clients over HTTP with JSON responses. The lifespan
+    # closes the shared HTTP client on shutdown.
+    transport = os.getenv("MCP_TRANSPORT", "stdio")
+    mcp.run(transport=transport)
 
 
 if __name__ == "__main__":